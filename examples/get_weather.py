@@ -6,6 +6,7 @@ import json
 
 from squad_ai import Framework
 from squad_ai.agent import AgentConfig
+from squad_ai.events import EventType, console_subscriber, get_default_bus
 from squad_ai.interpreter import Interpreter
 from squad_ai.persona import Persona
 from squad_ai.prompt_engine import PromptEngine
@@ -36,6 +37,11 @@ def get_current_weather(location: str, unit: str = "fahrenheit") -> str:
 
 if __name__ == "__main__":
 
+    # Print what the agents are doing
+    get_default_bus().subscribe(
+        console_subscriber, [EventType.TOOL_INVOKED, EventType.TASK_FINISHED]
+    )
+
     dynamic_weather = DynamicTool(
         get_current_weather, description="Get the current weather in a given location."
     )
@@ -66,3 +72,4 @@ if __name__ == "__main__":
 
     weather_agent.perform_task("What is the current temprature in Paris.")
     weather_agent.perform_task("How about Sydney?")
+    get_default_bus().flush()
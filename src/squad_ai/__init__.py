@@ -19,6 +19,11 @@ from .interpreter import Interpreter
 from .tools.base_tool import Tool
 from .prompt_engine import PromptEngine
 from .framework import Framework
+from .events import EventBus, EventType
+from .rate_limiter import RateLimiter
+from .cassette import Cassette
+from .batch import BatchRunner
+from .memory import MemoryLimits
 
 __all__ = [
     "Agent",
@@ -27,4 +32,10 @@ __all__ = [
     "Tool",
     "PromptEngine",
     "Framework",
+    "EventBus",
+    "EventType",
+    "RateLimiter",
+    "Cassette",
+    "BatchRunner",
+    "MemoryLimits",
 ]
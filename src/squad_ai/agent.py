@@ -6,10 +6,12 @@ using their persona, a language model (LLM), and tools. Each agent is designed
 to interact with the environment based on its defined role and behavior.
 """
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import json
 from pydantic import BaseModel
 
+from squad_ai.events import EventBus, EventType, get_default_bus
+from squad_ai.memory import approximate_size
 from squad_ai.prompt_engine import PromptEngine
 from squad_ai.persona import Persona
 from squad_ai.interpreter import Interpreter
@@ -25,12 +27,14 @@ class AgentConfig(BaseModel):
         llm_wrapper (Interpreter): An interpreter wrapper around an LLM model.
         tools (dict): A dictionary mapping tool names to their instances.
         prompt_engine (PromptEngine): Optional prompt engine for generating prompts.
+        event_bus (EventBus): Optional event bus; defaults to the process-wide bus.
     """
 
     persona: Persona
     llm_wrapper: Optional[Interpreter] = None
     tools: Optional[List[Tool]] = None
     prompt_engine: Optional[PromptEngine] = None
+    event_bus: Optional[EventBus] = None
 
     class Config:
         """Pydantic model configuration."""
@@ -47,6 +51,7 @@ class Agent:
         llm_wrapper (Interpreter): An interpreter wrapper around an LLM model.
         tools (dict): A dictionary mapping tool names to their instances.
         prompt_engine (PromptEngine): Optional prompt engine for generating prompts.
+        event_bus (EventBus): The event bus the agent publishes its progress to.
     """
 
     def __init__(
@@ -70,6 +75,11 @@ class Agent:
             tool.get_schema().get("function")["name"]: tool for tool in config.tools or []
         }  # Map tool names to instances
         self.prompt_engine = config.prompt_engine
+        self.event_bus = config.event_bus or get_default_bus()
+        # The configuration does not change, so its size is only measured once
+        self._config_bytes = approximate_size(config.persona.model_dump()) + sum(
+            approximate_size(tool.get_schema()) for tool in self.tools.values()
+        )
 
     def perform_task(self, task: str) -> str:
         """Perform a task using the agent's capabilities.
@@ -80,41 +90,119 @@ class Agent:
         Returns:
             The result of the task as a string.
         """
+        prompt, tool_schemas = self.start_task(task)
+
+        # Call the LLM
+        response = self.llm_wrapper.interpret(prompt, tool_schemas)
+        tool_result = self.handle_response(response)
+
+        while tool_result is not None:
+            response = self.llm_wrapper.update_tool_response(*tool_result, tool_schemas)
+            tool_result = self.handle_response(response)
+
+        return response.content
+
+    def start_task(self, task: str) -> Tuple[str, List[Dict[str, Any]]]:
+        """Prepare the first LLM call of a task.
+
+        Args:
+            task: The task to be performed.
+
+        Returns:
+            The prompt for the task and the tool schemas to send with it.
+        """
+        self.event_bus.publish(
+            EventType.TASK_STARTED, agent=self.name, persona=self.persona.name, task=task
+        )
+
         # Generate a custom prompt
         prompt = self.prompt_engine.generate_prompt(self.persona, task)
 
         # Define the tool schemas for the LLM
         tool_schemas = [tool.get_schema() for tool in self.tools.values()]
 
-        # Call the LLM
-        response = self.llm_wrapper.interpret(prompt, tool_schemas)
+        return prompt, tool_schemas
 
-        while True:
-            # Process the response
-            if response.tool_calls:
-                tool_call = response.tool_calls[0]
-                # Extract the function name and arguments
-                function_name = tool_call.function.name
-                function_args = json.loads(tool_call.function.arguments)
-
-                # Find and execute the corresponding tool
-                if function_name in self.tools:
-                    tool = self.tools[function_name]
-                    print(
-                        f"\n{self.name} ({self.persona.name}) is executing tool: {function_name}"
-                    )
-                    tool_response = tool.execute(**function_args)
-                    response = self.llm_wrapper.update_tool_response(
-                        tool_call.id, tool_response, tool_schemas
-                    )
-                else:
-                    print(f"Tool '{function_name}' not found.")
-                    break
-            else:
-                print(f"\n{self.name} ({self.persona.name}) says: {response.content}")
-                break
+    def handle_response(self, response) -> Optional[Tuple[str, str]]:
+        """Process an LLM response, executing the tool it asks for.
 
-        return response.content
+        Args:
+            response: The response message returned by the LLM.
+
+        Returns:
+            The tool call id and the tool result to send back to the LLM,
+            or None if the task is finished.
+        """
+        self.event_bus.publish(
+            EventType.LLM_RESPONSE,
+            agent=self.name,
+            persona=self.persona.name,
+            response=response,
+        )
+
+        if not response.tool_calls:
+            self.event_bus.publish(
+                EventType.TASK_FINISHED,
+                agent=self.name,
+                persona=self.persona.name,
+                content=response.content,
+            )
+            return None
+
+        tool_call = response.tool_calls[0]
+        # Extract the function name and arguments
+        function_name = tool_call.function.name
+        function_args = json.loads(tool_call.function.arguments)
+
+        # Find and execute the corresponding tool
+        if function_name not in self.tools:
+            self.event_bus.publish(
+                EventType.TASK_FINISHED,
+                agent=self.name,
+                persona=self.persona.name,
+                content=response.content,
+                error=f"Tool '{function_name}' not found.",
+            )
+            return None
+
+        tool = self.tools[function_name]
+        self.event_bus.publish(
+            EventType.TOOL_INVOKED,
+            agent=self.name,
+            persona=self.persona.name,
+            tool=function_name,
+            arguments=function_args,
+        )
+        tool_response = self._execute_tool(tool, function_name, function_args)
+        self.event_bus.publish(
+            EventType.TOOL_COMPLETED,
+            agent=self.name,
+            persona=self.persona.name,
+            tool=function_name,
+            result=tool_response,
+        )
+        return tool_call.id, tool_response
+
+    def _execute_tool(self, tool: Tool, name: str, arguments: Dict[str, Any]) -> str:
+        """Execute a tool, going through the interpreter's cassette if it has one."""
+        cassette = self.llm_wrapper.config.cassette
+        if cassette is None:
+            return tool.execute(**arguments)
+        return cassette.tool_result(name, arguments, lambda: tool.execute(**arguments))
+
+    def memory_usage(self) -> Dict[str, int]:
+        """Report the approximate memory held by the agent.
+
+        Returns:
+            The approximate bytes held by the agent's configuration, by its
+            interpreter's history, and their total.
+        """
+        history_bytes = self.llm_wrapper.memory.bytes if self.llm_wrapper else 0
+        return {
+            "config": self._config_bytes,
+            "history": history_bytes,
+            "total": self._config_bytes + history_bytes,
+        }
 
     def __str__(self):
         """
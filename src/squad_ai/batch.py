@@ -0,0 +1,350 @@
+"""
+This module provides an offline batch mode for running many agent tasks at once.
+
+Instead of calling the language model synchronously for every turn, the
+`BatchRunner` collects the pending request of every task into a batch JSON
+lines file in the chat completions batch format, submits it through a
+`BatchBackend` and polls for the results. Each agent then resumes its loop
+from the returned message; tool calls are executed locally and the follow-up
+requests are submitted as the next batch, until every task is finished.
+
+Classes:
+    - BatchError(Exception): Raised when a batch fails or returns unusable output.
+    - BatchBackend(ABC): Submits batch files and polls for their results.
+    - OpenAIBatchBackend(BatchBackend): Uses the OpenAI compatible batch API.
+    - LocalBatchBackend(BatchBackend): Answers batches locally, for testing.
+    - BatchRunner: Drives many agent tasks through a batch backend.
+
+Usage:
+    >>> from squad_ai.batch import BatchRunner, OpenAIBatchBackend
+    >>> runner = BatchRunner(OpenAIBatchBackend(openai.Client()), directory="batches")
+    >>> results = runner.run([(agent_a, "task one"), (agent_b, "task two")])
+"""
+
+import json
+import os
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import openai
+from openai.types.chat import ChatCompletionMessage
+
+from squad_ai.agent import Agent
+from squad_ai.events import EventType
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+
+
+class BatchError(Exception):
+    """
+    Custom exception raised when a batch fails or returns unusable output.
+    """
+
+
+class BatchBackend(ABC):
+    """
+    Abstract base class for batch backends.
+    Methods
+    -------
+    submit(path: str) -> str
+        Submit a batch input file and return the batch id.
+    poll(batch_id: str) -> Optional[List[Dict[str, Any]]]
+        Return the output lines of a finished batch, or None while it is running.
+    cleanup(batch_id: str) -> None
+        Delete the files the backend keeps for a batch.
+    """
+
+    @abstractmethod
+    def submit(self, path: str) -> str:
+        """Submit a batch input file and return the batch id."""
+
+    @abstractmethod
+    def poll(self, batch_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Return the output lines of a finished batch, or None while it is running."""
+
+    def cleanup(self, batch_id: str) -> None:
+        """Delete the files the backend keeps for a batch."""
+
+
+class OpenAIBatchBackend(BatchBackend):
+    """
+    Batch backend using the batch API of an OpenAI compatible endpoint.
+
+    Attributes:
+        client (openai.Client): The client used to upload files and manage batches.
+        completion_window (str): The completion window requested for each batch.
+    """
+
+    FAILED_STATUSES = ("failed", "expired", "cancelled", "cancelling")
+
+    def __init__(self, client: openai.Client, completion_window: str = "24h"):
+        self.client = client
+        self.completion_window = completion_window
+
+    def submit(self, path: str) -> str:
+        with open(path, "rb") as batch_file:
+            uploaded = self.client.files.create(file=batch_file, purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=uploaded.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=self.completion_window,
+        )
+        return batch.id
+
+    def poll(self, batch_id: str) -> Optional[List[Dict[str, Any]]]:
+        batch = self.client.batches.retrieve(batch_id)
+        if batch.status in self.FAILED_STATUSES:
+            raise BatchError(f"Batch '{batch_id}' ended with status '{batch.status}'.")
+        if batch.status != "completed":
+            return None
+        lines = []
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id:
+                content = self.client.files.content(file_id).text
+                lines.extend(json.loads(line) for line in content.splitlines() if line)
+        return lines
+
+    def cleanup(self, batch_id: str) -> None:
+        batch = self.client.batches.retrieve(batch_id)
+        for file_id in (batch.input_file_id, batch.output_file_id, batch.error_file_id):
+            if file_id:
+                try:
+                    self.client.files.delete(file_id)
+                except openai.NotFoundError:
+                    continue
+
+
+class LocalBatchBackend(BatchBackend):
+    """
+    Batch backend answering every request with a local callable, for testing.
+
+    The output file is written next to the input file when the batch is
+    submitted, so the first poll already returns the results.
+
+    Attributes:
+        responder (Callable[[Dict[str, Any]], Dict[str, Any]]): Returns a chat
+            completion (as a dictionary) for a request body.
+    """
+
+    def __init__(self, responder: Callable[[Dict[str, Any]], Dict[str, Any]]):
+        self.responder = responder
+
+    def submit(self, path: str) -> str:
+        output_path = f"{os.path.splitext(path)[0]}.output.jsonl"
+        with open(path, encoding="utf-8") as batch_input, open(
+            output_path, "w", encoding="utf-8"
+        ) as batch_output:
+            for line in batch_input:
+                if not line.strip():
+                    continue
+                request = json.loads(line)
+                result = {
+                    "id": f"batch_req_{uuid.uuid4().hex}",
+                    "custom_id": request["custom_id"],
+                    "response": {
+                        "status_code": 200,
+                        "body": self.responder(request["body"]),
+                    },
+                    "error": None,
+                }
+                batch_output.write(json.dumps(result) + "\n")
+        return output_path
+
+    def poll(self, batch_id: str) -> Optional[List[Dict[str, Any]]]:
+        if not os.path.exists(batch_id):
+            return None
+        with open(batch_id, encoding="utf-8") as batch_output:
+            return [json.loads(line) for line in batch_output if line.strip()]
+
+    def cleanup(self, batch_id: str) -> None:
+        if os.path.exists(batch_id):
+            os.remove(batch_id)
+
+
+class BatchRunner:
+    """
+    Runs many agent tasks through a batch backend, one batch per turn.
+
+    Batch files are deleted once their results have been read.
+
+    Attributes:
+        backend (BatchBackend): The backend batches are submitted to.
+        directory (str): Where batch input files are written.
+        poll_interval (float): Seconds between two polls of a running batch.
+        timeout (float): Seconds to wait for one batch before giving up; None waits forever.
+    """
+
+    def __init__(
+        self,
+        backend: BatchBackend,
+        directory: str = ".",
+        poll_interval: float = 30.0,
+        timeout: Optional[float] = 25 * 3600.0,
+    ):
+        """
+        Initialize a batch runner.
+
+        Args:
+            backend (BatchBackend): The backend batches are submitted to.
+            directory (str, optional): Where batch input files are written.
+            poll_interval (float, optional): Seconds between two polls.
+            timeout (float, optional): Seconds to wait for one batch. Defaults to a
+                little more than the 24 hour completion window.
+        """
+        self.backend = backend
+        self.directory = directory
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+
+    def run(self, jobs: List[Tuple[Agent, str]]) -> List[Optional[str]]:
+        """
+        Perform every task, submitting each turn of all tasks as one batch.
+
+        Interpreters with a cassette record the batched responses, or replay
+        them without submitting their requests. Batched responses are recorded
+        with no latency, since the wait for a batch is not a request's latency.
+
+        Args:
+            jobs (List[Tuple[Agent, str]]): The agents and the tasks they perform.
+                Every agent must use its own interpreter, since the turns of
+                all tasks are interleaved.
+
+        Returns:
+            List[Optional[str]]: The result of each task, in the order of `jobs`;
+                None for tasks whose request failed in the batch.
+
+        Raises:
+            ValueError: If two jobs share an interpreter.
+            BatchError: If a batch fails, times out or its output is incomplete.
+        """
+        if len({id(agent.llm_wrapper) for agent, _ in jobs}) != len(jobs):
+            raise ValueError("Every batched job needs an agent with its own interpreter.")
+
+        run_id = uuid.uuid4().hex[:8]
+        results: List[Optional[str]] = [None] * len(jobs)
+        tool_schemas = {}
+        requests = {}
+        for index, (agent, task) in enumerate(jobs):
+            prompt, tool_schemas[index] = agent.start_task(task)
+            requests[index] = agent.llm_wrapper.prepare_prompt(prompt, tool_schemas[index])
+
+        turn = 0
+        while requests:
+            responses = self._respond(
+                jobs, requests, os.path.join(self.directory, f"batch-{run_id}-{turn}.jsonl")
+            )
+            requests = {}
+            for index, (message, error) in responses.items():
+                next_request, results[index] = self._resume(
+                    jobs[index][0], message, error, tool_schemas[index]
+                )
+                if next_request is not None:
+                    requests[index] = next_request
+            turn += 1
+
+        return results
+
+    @staticmethod
+    def _resume(
+        agent: Agent,
+        message: Optional[ChatCompletionMessage],
+        error: Optional[str],
+        tool_schemas: List[Dict[str, Any]],
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Resume an agent's loop from a batch result.
+
+        Returns the next request to batch and the task result; the request is
+        None once the task is finished, the result is None until then.
+        """
+        if error is not None:
+            agent.event_bus.publish(
+                EventType.TASK_FINISHED,
+                agent=agent.name,
+                persona=agent.persona.name,
+                error=error,
+            )
+            return None, None
+        response = agent.llm_wrapper.accept_response(message)
+        tool_result = agent.handle_response(response)
+        if tool_result is None:
+            return None, response.content
+        return agent.llm_wrapper.prepare_tool_response(*tool_result, tool_schemas), None
+
+    def _respond(
+        self, jobs: List[Tuple[Agent, str]], requests: Dict[int, Dict[str, Any]], path: str
+    ) -> Dict[int, Tuple[Optional[ChatCompletionMessage], Optional[str]]]:
+        """Answer one turn of requests, from cassettes where replaying, else as a batch."""
+        responses = {}
+        batched = {}
+        for index, request in requests.items():
+            cassette = jobs[index][0].llm_wrapper.config.cassette
+            if cassette is not None and cassette.replaying:
+                responses[index] = (cassette.replay_response(request), None)
+            else:
+                batched[index] = request
+        if not batched:
+            return responses
+
+        responses.update(self._run_batch(path, batched))
+        for index, request in batched.items():
+            cassette = jobs[index][0].llm_wrapper.config.cassette
+            message = responses[index][0]
+            if cassette is not None and message is not None:
+                cassette.record_response(request, message, elapsed=0.0)
+        return responses
+
+    def _run_batch(
+        self, path: str, requests: Dict[int, Dict[str, Any]]
+    ) -> Dict[int, Tuple[Optional[ChatCompletionMessage], Optional[str]]]:
+        """Submit one batch and wait for the response message or error of each request."""
+        with open(path, "w", encoding="utf-8") as batch_file:
+            for index, body in requests.items():
+                line = {
+                    "custom_id": str(index),
+                    "method": "POST",
+                    "url": BATCH_ENDPOINT,
+                    "body": body,
+                }
+                batch_file.write(json.dumps(line, default=str) + "\n")
+
+        try:
+            batch_id = self.backend.submit(path)
+        finally:
+            os.remove(path)
+        try:
+            output = self._wait(batch_id)
+        finally:
+            self.backend.cleanup(batch_id)
+
+        responses = {}
+        for line in output:
+            index = int(line["custom_id"])
+            response = line.get("response") or {}
+            if line.get("error") or response.get("status_code") != 200:
+                error = line.get("error") or response.get("body")
+                responses[index] = (None, f"Batch request failed: {error}")
+                continue
+            message = response["body"]["choices"][0]["message"]
+            responses[index] = (ChatCompletionMessage.model_validate(message), None)
+
+        missing = set(requests) - set(responses)
+        if missing:
+            raise BatchError(
+                f"Batch '{batch_id}' returned no result for requests {sorted(missing)}."
+            )
+        return responses
+
+    def _wait(self, batch_id: str) -> List[Dict[str, Any]]:
+        """Poll a batch until it is finished or the timeout has passed."""
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        output = self.backend.poll(batch_id)
+        while output is None:
+            if deadline is not None and time.monotonic() >= deadline:
+                raise BatchError(
+                    f"Batch '{batch_id}' did not finish within {self.timeout} seconds."
+                )
+            time.sleep(self.poll_interval)
+            output = self.backend.poll(batch_id)
+        return output
@@ -0,0 +1,239 @@
+"""
+This module provides record/replay cassettes for deterministic offline agent runs.
+
+In record mode every request sent to the language model, its response and
+every tool result are appended to a JSON lines cassette file. In replay mode
+the recorded responses and tool results are served back from memory, so agent
+workflows can be benchmarked and regression tested without a network.
+
+Requests are matched either strictly, on the full request (model, history and
+tools), or fuzzily, on the model and the normalized content of the latest
+message only. Responses can be served instantly, after a fixed delay, or after
+the latency observed while recording.
+
+Classes:
+    - CassetteMismatchError(Exception): Raised when a replayed request was not recorded.
+    - Cassette: Records and replays language model responses and tool results.
+
+Usage:
+    >>> from squad_ai.cassette import Cassette
+    >>> recording = InterpreterConfig(cassette=Cassette("run.jsonl", mode="record"))
+    >>> interpreter = Interpreter(api_key="...", config=recording)
+    >>> # later, offline
+    >>> replaying = InterpreterConfig(cassette=Cassette("run.jsonl", mode="replay"))
+    >>> interpreter = Interpreter(api_key="...", config=replaying)
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Callable, Deque, Dict, Optional, Union
+
+from openai.types.chat import ChatCompletionMessage
+
+
+class CassetteMismatchError(Exception):
+    """
+    Custom exception raised when a replayed request has no recorded counterpart.
+    """
+
+
+def _digest(value: Any) -> str:
+    """Return a stable hash of a JSON serializable value."""
+    encoded = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:32]
+
+
+class Cassette:
+    """
+    Records and replays language model responses and tool results.
+
+    Attributes:
+        path (str): The cassette file.
+        mode (str): Either "record" or "replay".
+        match (str): Either "strict" or "fuzzy" request matching.
+        latency (Union[None, float, str]): Replay delay; None for no delay,
+            a number of seconds, or "recorded" for the recorded latency.
+    """
+
+    MODES = ("record", "replay")
+    MATCHES = ("strict", "fuzzy")
+
+    def __init__(
+        self,
+        path: str,
+        mode: str = "replay",
+        match: str = "strict",
+        latency: Union[None, float, str] = None,
+    ):
+        """
+        Initialize a cassette.
+
+        Args:
+            path (str): The cassette file. Records are appended to it.
+            mode (str, optional): Either "record" or "replay".
+            match (str, optional): Either "strict" or "fuzzy" request matching.
+            latency (Union[None, float, str], optional): Simulated replay latency.
+
+        Raises:
+            ValueError: If the mode or match strategy is unknown.
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown cassette mode '{mode}', expected one of {self.MODES}.")
+        if match not in self.MATCHES:
+            raise ValueError(
+                f"Unknown cassette match '{match}', expected one of {self.MATCHES}."
+            )
+        self.path = path
+        self.mode = mode
+        self.match = match
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._file = None
+        # Replay records by kind ("llm" or "tool") and key, loaded on first use
+        self._index: Optional[Dict[str, Dict[str, Deque[Dict[str, Any]]]]] = None
+
+    @property
+    def replaying(self) -> bool:
+        """Return True if the cassette serves recorded responses."""
+        return self.mode == "replay"
+
+    @staticmethod
+    def _request_keys(request: Dict[str, Any]) -> Dict[str, str]:
+        """Return the strict and fuzzy keys of a language model request."""
+        last = request["messages"][-1]
+        content = " ".join(str(last.get("content") or "").lower().split())
+        return {
+            "strict": _digest(
+                [request["model"], request["messages"], request.get("tools")]
+            ),
+            "fuzzy": _digest([request["model"], last.get("role"), content]),
+        }
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        """Append one compact record to the cassette file."""
+        line = json.dumps(record, separators=(",", ":"), default=str) + "\n"
+        with self._lock:
+            if self._file is None:
+                # pylint: disable-next=consider-using-with
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line)
+            self._file.flush()
+
+    def _load(self) -> None:
+        """Index the cassette file for replay."""
+        index = {"llm": defaultdict(deque), "tool": defaultdict(deque)}
+        with open(self.path, encoding="utf-8") as cassette:
+            for line in cassette:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if record["kind"] == "llm":
+                    index["llm"][record[self.match]].append(record)
+                else:
+                    index["tool"][record["key"]].append(record)
+        self._index = index
+
+    def _take(self, kind: str, key: str, description: str) -> Dict[str, Any]:
+        """Pop the next record of `kind` recorded under `key`, loading the file on first use."""
+        with self._lock:
+            if self._index is None:
+                self._load()
+            index = self._index[kind]
+            if not index.get(key):
+                raise CassetteMismatchError(
+                    f"No recorded {description} in '{self.path}' matches the request."
+                )
+            record = index[key].popleft()
+        self._simulate_latency(record.get("elapsed", 0.0))
+        return record
+
+    def _simulate_latency(self, recorded: float) -> None:
+        if self.latency == "recorded":
+            time.sleep(recorded)
+        elif self.latency:
+            time.sleep(float(self.latency))
+
+    def record_response(
+        self, request: Dict[str, Any], message: ChatCompletionMessage, elapsed: float
+    ) -> None:
+        """
+        Record a language model response.
+
+        Only the request keys and the latest message are stored, keeping the
+        cassette small even for long histories.
+
+        Args:
+            request (Dict[str, Any]): The request sent to the language model.
+            message (ChatCompletionMessage): The response message.
+            elapsed (float): Seconds the request took.
+        """
+        self._write(
+            {
+                "kind": "llm",
+                **self._request_keys(request),
+                "message": request["messages"][-1],
+                "response": message.model_dump(exclude_none=True),
+                "elapsed": round(elapsed, 4),
+            }
+        )
+
+    def replay_response(self, request: Dict[str, Any]) -> ChatCompletionMessage:
+        """
+        Return the recorded response for a language model request.
+
+        Args:
+            request (Dict[str, Any]): The request that would be sent to the language model.
+
+        Returns:
+            ChatCompletionMessage: The recorded response message.
+
+        Raises:
+            CassetteMismatchError: If no unused recording matches the request.
+        """
+        key = self._request_keys(request)[self.match]
+        record = self._take("llm", key, "response")
+        return ChatCompletionMessage.model_validate(record["response"])
+
+    def tool_result(
+        self, name: str, arguments: Dict[str, Any], execute: Callable[[], str]
+    ) -> str:
+        """
+        Run a tool while recording, or return its recorded result while replaying.
+
+        Args:
+            name (str): The tool name.
+            arguments (Dict[str, Any]): The arguments the tool is called with.
+            execute (Callable[[], str]): Runs the tool; only called while recording.
+
+        Returns:
+            str: The tool result.
+
+        Raises:
+            CassetteMismatchError: If replaying and the call was not recorded.
+        """
+        key = _digest([name, arguments])
+        if self.replaying:
+            return self._take("tool", key, f"result of tool '{name}'")["result"]
+
+        start = time.monotonic()
+        result = execute()
+        self._write(
+            {
+                "kind": "tool",
+                "key": key,
+                "name": name,
+                "result": result,
+                "elapsed": round(time.monotonic() - start, 4),
+            }
+        )
+        return result
+
+    def close(self) -> None:
+        """Close the cassette file if it is open for recording."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,241 @@
+"""
+This module provides a non-blocking event bus used by agents to report
+what they are doing without writing to stdout on the hot path.
+
+Events are published to a bounded queue and dispatched to subscribers by a
+background worker thread. Nothing is queued, and no message is formatted,
+unless somebody is subscribed to the event type being published.
+
+Classes:
+    - EventType: The kinds of events emitted by agents.
+    - Event: A single event with its raw payload; formatted only on demand.
+    - EventBus: Bounded, thread-backed publish/subscribe dispatcher.
+
+Functions:
+    - get_default_bus: Returns the process-wide default event bus.
+    - console_subscriber: A subscriber that prints events to stdout.
+
+Usage:
+    >>> from squad_ai.events import get_default_bus, console_subscriber
+    >>> get_default_bus().subscribe(console_subscriber)
+"""
+
+import queue
+import threading
+import time
+from enum import Enum
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+class EventType(str, Enum):
+    """The kinds of events emitted while an agent performs a task."""
+
+    TASK_STARTED = "task_started"
+    TOOL_INVOKED = "tool_invoked"
+    TOOL_COMPLETED = "tool_completed"
+    LLM_RESPONSE = "llm_response"
+    TASK_FINISHED = "task_finished"
+
+
+class Event:
+    """
+    A single event published on the bus.
+
+    The payload is kept as raw objects; the human readable message is only
+    built when `format` (or `str`) is called by a subscriber.
+
+    Attributes:
+        type (EventType): The kind of event.
+        payload (Dict[str, Any]): The raw event data.
+        timestamp (float): The time the event was published.
+    """
+
+    __slots__ = ("type", "payload", "timestamp")
+
+    _TEMPLATES = {
+        EventType.TASK_STARTED: "\n{agent} ({persona}) started task: {task}",
+        EventType.TOOL_INVOKED: "\n{agent} ({persona}) is executing tool: {tool}",
+        EventType.TOOL_COMPLETED: "{agent} ({persona}) tool '{tool}' returned: {result}",
+        EventType.LLM_RESPONSE: "{agent} ({persona}) received a response from the LLM.",
+        EventType.TASK_FINISHED: "\n{agent} ({persona}) says: {content}",
+    }
+
+    def __init__(self, event_type: EventType, payload: Dict[str, Any]):
+        self.type = event_type
+        self.payload = payload
+        self.timestamp = time.time()
+
+    def format(self) -> str:
+        """
+        Build the human readable message for this event.
+
+        Returns:
+            str: The formatted message.
+        """
+        if self.payload.get("error"):
+            return f"{self.payload['error']}"
+        return self._TEMPLATES[self.type].format_map(_MissingAsEmpty(self.payload))
+
+    def __str__(self):
+        return self.format()
+
+    def __repr__(self):
+        return f"Event({self.type.value}, {self.payload!r})"
+
+
+class _MissingAsEmpty(dict):
+    """Mapping used to format templates when a payload key is absent."""
+
+    def __missing__(self, key):
+        return ""
+
+
+class EventBus:
+    """
+    A publish/subscribe event bus backed by a bounded queue and a worker thread.
+
+    Attributes:
+        maxsize (int): Maximum number of events waiting to be dispatched.
+        backpressure (str): What to do when the queue is full; "drop" discards
+            the new event, "block" waits for room in the queue.
+        dropped (int): Number of events discarded because the queue was full.
+    """
+
+    BACKPRESSURE_MODES = ("drop", "block")
+
+    def __init__(self, maxsize: int = 10000, backpressure: str = "drop"):
+        """
+        Initialize the event bus.
+
+        Args:
+            maxsize (int, optional): Maximum number of queued events.
+            backpressure (str, optional): Either "drop" or "block".
+
+        Raises:
+            ValueError: If the backpressure mode is unknown.
+        """
+        if backpressure not in self.BACKPRESSURE_MODES:
+            raise ValueError(
+                f"Unknown backpressure mode '{backpressure}', "
+                f"expected one of {self.BACKPRESSURE_MODES}."
+            )
+        self.maxsize = maxsize
+        self.backpressure = backpressure
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._subscribers: Dict[EventType, List[Callable[[Event], None]]] = {
+            event_type: [] for event_type in EventType
+        }
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+
+    def subscribe(
+        self,
+        callback: Callable[[Event], None],
+        event_types: Optional[Iterable[EventType]] = None,
+    ) -> None:
+        """
+        Register a callback for the given event types.
+
+        Args:
+            callback (Callable[[Event], None]): Called from the worker thread
+                for each matching event.
+            event_types (Iterable[EventType], optional): Event types to receive.
+                Defaults to all event types.
+        """
+        with self._lock:
+            for event_type in event_types or EventType:
+                # Copy on write so publishers can read the list without locking
+                self._subscribers[event_type] = self._subscribers[event_type] + [
+                    callback
+                ]
+            self._ensure_worker()
+
+    def unsubscribe(self, callback: Callable[[Event], None]) -> None:
+        """
+        Remove a callback from all event types.
+
+        Args:
+            callback (Callable[[Event], None]): The callback to remove.
+        """
+        with self._lock:
+            for event_type, callbacks in self._subscribers.items():
+                self._subscribers[event_type] = [
+                    subscriber for subscriber in callbacks if subscriber is not callback
+                ]
+
+    def has_subscribers(self, event_type: EventType) -> bool:
+        """Return True if anybody listens to the given event type."""
+        return bool(self._subscribers[event_type])
+
+    def publish(self, event_type: EventType, **payload: Any) -> None:
+        """
+        Publish an event without blocking on subscriber I/O.
+
+        The event is only created and queued if somebody is subscribed to its
+        type. When the queue is full the event is dropped or the caller waits,
+        depending on the backpressure mode. Events published by a subscriber,
+        from the worker thread, are never waited for since only that thread
+        empties the queue; they are dropped when it is full.
+
+        Args:
+            event_type (EventType): The kind of event.
+            **payload: Raw event data; formatting is deferred to subscribers.
+        """
+        if not self.has_subscribers(event_type):
+            return
+
+        event = Event(event_type, payload)
+        if self.backpressure == "block" and threading.current_thread() is not self._worker:
+            self._queue.put(event)
+            return
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    def flush(self) -> None:
+        """Block until every queued event has been dispatched."""
+        if self._worker is not None:
+            self._queue.join()
+
+    def _ensure_worker(self) -> None:
+        """Start the dispatch thread if it is not running yet."""
+        if self._worker is None:
+            self._worker = threading.Thread(
+                target=self._dispatch, name="squad-ai-events", daemon=True
+            )
+            self._worker.start()
+
+    def _dispatch(self) -> None:
+        """Worker loop delivering queued events to their subscribers."""
+        while True:
+            event = self._queue.get()
+            try:
+                for callback in self._subscribers[event.type]:
+                    try:
+                        callback(event)
+                    except Exception:  # pylint: disable=broad-exception-caught
+                        # A faulty subscriber must not stop event delivery
+                        pass
+            finally:
+                self._queue.task_done()
+
+
+def console_subscriber(event: Event) -> None:
+    """Print events to stdout, reproducing the framework's console output."""
+    print(event.format())
+
+
+_DEFAULT_BUS = EventBus()
+
+
+def get_default_bus() -> EventBus:
+    """
+    Return the process-wide default event bus.
+
+    Returns:
+        EventBus: The shared event bus used by agents without their own bus.
+    """
+    return _DEFAULT_BUS
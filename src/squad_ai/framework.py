@@ -9,9 +9,14 @@ Classes:
 Methods:
     - `create_agent`: Creates and registers a new agent with specified details.
     - `list_agents`: Lists all registered agents.
+    - `memory_usage`: Reports the approximate memory held by each agent.
+    - `total_memory_usage`: Reports the approximate memory held by all agents.
 """
 
+from typing import Dict
+
 from squad_ai.agent import AgentConfig
+from squad_ai.memory import MemoryLimits
 
 from . import Agent
 
@@ -21,8 +26,15 @@ class Framework:
     A class for managing and creating agents.
     """
 
-    def __init__(self):
+    def __init__(self, memory_limits: MemoryLimits = None):
+        """
+        Args:
+            memory_limits (MemoryLimits, optional): Default caps applied to the
+                interpreters of created agents that have no limits of their own.
+                Such an interpreter gets a copy of its config with these limits.
+        """
         self.agents = {}
+        self.memory_limits = memory_limits
 
     def create_agent(
         self,
@@ -47,6 +59,17 @@ class Framework:
         if name in self.agents:
             raise ValueError(f"An agent with the name {name} already exists.")
 
+        interpreter = config.llm_wrapper
+        if (
+            interpreter is not None
+            and self.memory_limits is not None
+            and interpreter.config.memory_limits is None
+        ):
+            # Copy the config, which may be shared with other interpreters
+            interpreter.config = interpreter.config.model_copy(
+                update={"memory_limits": self.memory_limits}
+            )
+
         agent = Agent(name, config)
         self.agents[name] = agent
 
@@ -56,3 +79,28 @@ class Framework:
         """List all registered agents."""
         for _, agent in self.agents.items():
             print(agent)
+
+    def memory_usage(self) -> Dict[str, Dict[str, int]]:
+        """
+        Reports the approximate memory held by each agent.
+        Returns:
+            Dict[str, Dict[str, int]]: The memory usage of each agent, by name.
+                Agents sharing an interpreter each report its full history.
+        """
+        return {name: agent.memory_usage() for name, agent in self.agents.items()}
+
+    def total_memory_usage(self) -> int:
+        """
+        Reports the approximate memory held by all agents.
+        Returns:
+            int: The total in bytes, counting shared interpreters once.
+        """
+        interpreters = {
+            id(agent.llm_wrapper): agent.llm_wrapper
+            for agent in self.agents.values()
+            if agent.llm_wrapper is not None
+        }
+        config_bytes = sum(agent.memory_usage()["config"] for agent in self.agents.values())
+        return config_bytes + sum(
+            interpreter.memory.bytes for interpreter in interpreters.values()
+        )
@@ -5,6 +5,7 @@ This module provides the functionality to interpret prompts using
 a language model and interact with specified tools.
 
 Classes:
+    InterpreterConfig: Optional settings of an interpreter.
     Interpreter: A class that encapsulates the interaction 
     between the language model and external tools.
 
@@ -12,6 +13,12 @@ Methods:
     - __init__: Initializes an instance of the Interpreter.
     - _create_message: Creates a message dictionary for communication.
     - _call_llm: Internal method to call the language model.
+    - prepare_prompt: Adds a prompt to the history and returns the request to send.
+    - prepare_tool_response: Adds a tool result to the history and returns the request to send.
+    - accept_response: Adds a response received from the language model to the history.
+    - memory_usage: Reports the approximate memory held by the history.
+    - _build_request: Builds the chat completion request for the current history.
+    - _create_completion: Sends a request to the language model, honouring the rate limiter.
     - interpret: Interprets the given prompt using the specified tools.
     - update_tool_response: Updates the tool response by creating a 
       message and calling the language model.
@@ -41,8 +48,40 @@ print(response.content)  # Processed response from the language model
 ```
 """
 
-from typing import List, Dict, Any
+import json
+import time
+from typing import List, Dict, Any, Optional
 import openai
+from pydantic import BaseModel
+
+from squad_ai.cassette import Cassette
+from squad_ai.memory import HistoryUsage, MemoryLimits, truncate_text
+from squad_ai.rate_limiter import RateLimiter, backoff_delay, estimate_tokens
+
+# Errors the OpenAI client retries by default, besides rate limiting
+TRANSIENT_ERRORS = (openai.APIConnectionError, openai.ConflictError, openai.InternalServerError)
+
+
+class InterpreterConfig(BaseModel):
+    """
+    Interpreter configuration.
+
+    Attributes:
+        rate_limiter (RateLimiter): A limiter shared with other interpreters using the
+            same endpoint, see `RateLimiter.for_endpoint`. When set, retries on HTTP 429,
+            connection errors and server errors are handled by the interpreter, with the
+            limiter's retry budget, instead of by the OpenAI client.
+        cassette (Cassette): Records LLM responses, or replays them instead of calling the LLM.
+        memory_limits (MemoryLimits): Caps applied to the history and to tool results.
+    """
+
+    rate_limiter: Optional[RateLimiter] = None
+    cassette: Optional[Cassette] = None
+    memory_limits: Optional[MemoryLimits] = None
+
+    class Config:
+        """Pydantic model configuration."""
+        arbitrary_types_allowed = True
 
 
 class Interpreter:
@@ -54,18 +93,25 @@ class Interpreter:
         api_key: str,
         base_url: str = "https://api.openai.com/v1",
         model: str = "llama3.1",
+        config: InterpreterConfig = None,
     ):
         """Initializes an instance of the Interpreter.
         Args:
             api_key (str): The API key for accessing the language model.
             base_url (str, optional): The base URL for the API endpoint.
             model (str, optional): The model name to be used for processing.
+            config (InterpreterConfig, optional): Rate limiting, recording and memory settings.
         """
         self.api_key = api_key
         self.base_url = base_url
         self.model = model
-        self.llm = openai.Client(api_key=api_key, base_url=base_url)
+        self.config = config or InterpreterConfig()
+        if self.config.rate_limiter is None:
+            self.llm = openai.Client(api_key=api_key, base_url=base_url)
+        else:
+            self.llm = openai.Client(api_key=api_key, base_url=base_url, max_retries=0)
         self.history = []
+        self.memory = HistoryUsage()
 
     def _create_message(
         self, role: str, content: str, call_id: str = None
@@ -86,23 +132,131 @@ class Interpreter:
             message["tool_call_id"] = call_id
         return message
 
-    def _call_llm(self, message: Dict[str, Any], tools: List[Dict[str, Any]]):
+    def _call_llm(self, request: Dict[str, Any]):
         """Internal method to call the LLM and return its response."""
-        self.history.append(message)
-        response = self.llm.chat.completions.create(
-            model=self.model,
-            messages=self.history,
-            tools=tools,
-            tool_choice="auto",
+        cassette = self.config.cassette
+        if cassette is not None and cassette.replaying:
+            response_message = cassette.replay_response(request)
+        else:
+            start = time.monotonic()
+            response_message = self._create_completion(request).choices[0].message
+            if cassette is not None:
+                cassette.record_response(
+                    request, response_message, time.monotonic() - start
+                )
+        return self.accept_response(response_message)
+
+    def prepare_prompt(self, prompt: str, tools: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Adds a prompt to the history without calling the language model.
+        Args:
+            prompt (str): The input prompt to be interpreted.
+            tools (List[Dict[str, Any]]): A list of tools with their configurations.
+        Returns:
+            Dict[str, Any]: The chat completion request to send to the language model.
+        """
+        self._append_history(self._create_message(role="user", content=prompt))
+        return self._build_request(tools)
+
+    def prepare_tool_response(
+        self, call_id: str, result: str, tools: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Adds a tool result to the history without calling the language model.
+        Args:
+            call_id (str): The unique identifier for the call.
+            result (str): The result of tool call to be sent to the language model.
+            tools (List[Dict[str, Any]]): A list of tools with their configurations.
+        Returns:
+            Dict[str, Any]: The chat completion request to send to the language model.
+        """
+        limits = self.config.memory_limits
+        if limits is not None and limits.max_tool_output_bytes is not None:
+            if not isinstance(result, str):
+                result = json.dumps(result, default=str)
+            result = truncate_text(result, limits.max_tool_output_bytes)
+        self._append_history(
+            self._create_message(role="tool", content=result, call_id=call_id)
         )
-        response_message = response.choices[0].message
-        self.history.append(
+        return self._build_request(tools)
+
+    def accept_response(self, response_message):
+        """
+        Adds a response message received from the language model to the history.
+        Args:
+            response_message (ChatCompletionMessage): The response message.
+        Returns:
+            ChatCompletionMessage: The same response message.
+        """
+        self._append_history(
             self._create_message(
                 role=response_message.role, content=response_message.content
             )
         )
         return response_message
 
+    def memory_usage(self) -> Dict[str, int]:
+        """
+        Reports the approximate memory held by the history.
+        Returns:
+            Dict[str, int]: The history size in bytes and messages, and the number
+                of messages spilled to disk.
+        """
+        return {
+            "history_bytes": self.memory.bytes,
+            "history_messages": len(self.history),
+            "spilled_messages": self.memory.spilled_messages,
+        }
+
+    def _append_history(self, message: Dict[str, Any]) -> None:
+        """Add a message to the history, tracking its size and enforcing the limits."""
+        self.history.append(message)
+        self.memory.add(message)
+        if self.config.memory_limits is not None:
+            self.memory.enforce(self.history, self.config.memory_limits)
+
+    def _build_request(self, tools: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Build the chat completion request for the current history."""
+        return {
+            "model": self.model,
+            "messages": self.history,
+            "tools": tools,
+            "tool_choice": "auto",
+        }
+
+    def _create_completion(self, request: Dict[str, Any]):
+        """Send a request to the LLM, waiting for and reporting to the rate limiter."""
+        limiter = self.config.rate_limiter
+        if limiter is None:
+            return self.llm.chat.completions.create(**request)
+
+        estimated_tokens = estimate_tokens(request["messages"], request["tools"])
+        attempts = 0
+        while True:
+            attempts += 1
+            with limiter.limit(estimated_tokens, attempts) as outcome:
+                try:
+                    raw = self.llm.chat.completions.with_raw_response.create(**request)
+                except openai.RateLimitError as error:
+                    # The limiter pauses every interpreter before the retry
+                    outcome["rate_limited"] = True
+                    outcome["headers"] = error.response.headers
+                    if attempts > limiter.max_retries:
+                        raise
+                    continue
+                except TRANSIENT_ERRORS:
+                    outcome["failed"] = True
+                    if attempts > limiter.max_retries:
+                        raise
+                else:
+                    response = raw.parse()
+                    outcome["headers"] = raw.headers
+                    if response.usage is not None:
+                        outcome["used_tokens"] = response.usage.total_tokens
+                    return response
+            # Back off from a transient error without holding a concurrency slot
+            time.sleep(backoff_delay(attempts))
+
     def interpret(self, prompt: str, tools: List[Dict[str, Any]]):
         """
         Interprets the given prompt using the specified tools.
@@ -114,8 +268,7 @@ class Interpreter:
             Any: The result of the interpretation process, as returned by the language model.
         """
 
-        message = self._create_message(role="user", content=prompt)
-        return self._call_llm(message=message, tools=tools)
+        return self._call_llm(self.prepare_prompt(prompt, tools))
 
     def update_tool_response(
         self, call_id: str, result: str, tools: List[Dict[str, Any]]
@@ -130,5 +283,4 @@ class Interpreter:
             Any: The response from the language model.
         """
 
-        message = self._create_message(role="tool", content=result, call_id=call_id)
-        return self._call_llm(message=message, tools=tools)
+        return self._call_llm(self.prepare_tool_response(call_id, result, tools))
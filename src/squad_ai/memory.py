@@ -0,0 +1,196 @@
+"""
+This module provides memory accounting helpers and the limits applied to
+interpreter histories.
+
+Sizes are approximations based on `sys.getsizeof` and are computed once per
+message when it enters a history, so reporting memory usage never walks the
+whole history.
+
+Classes:
+    - MemoryLimits: Caps applied to an interpreter history and to tool outputs.
+    - HistoryUsage: Tracks the size of one history and evicts messages over the caps.
+
+Functions:
+    - approximate_size: Estimate the memory held by a message or configuration value.
+    - truncate_text: Cut a text down to a maximum number of bytes.
+
+Usage:
+    >>> from squad_ai.memory import MemoryLimits
+    >>> limits = MemoryLimits(max_history_bytes=1_000_000, max_tool_output_bytes=20_000)
+    >>> interpreter = Interpreter(api_key="...", config=InterpreterConfig(memory_limits=limits))
+"""
+
+import json
+import os
+import sys
+import uuid
+from typing import Any, Dict, List, Literal, Optional
+
+from pydantic import BaseModel
+
+TRUNCATION_MARKER = "\n...[truncated {omitted} bytes]"
+
+
+class MemoryLimits(BaseModel):
+    """
+    Caps applied to an interpreter history and to tool outputs.
+
+    Attributes:
+        max_history_bytes (int): Approximate bytes a history may hold.
+        max_history_messages (int): Number of messages a history may hold.
+        max_tool_output_bytes (int): Tool results are truncated to this size
+            before they enter the history; other results than text are
+            serialized to JSON first.
+        on_limit (str): "evict" drops messages over the caps, "spill" appends
+            them to a file in `spill_directory` before dropping them. See
+            `HistoryUsage.enforce` for which messages are kept.
+        spill_directory (str): Where spilled messages are written.
+    """
+
+    max_history_bytes: Optional[int] = None
+    max_history_messages: Optional[int] = None
+    max_tool_output_bytes: Optional[int] = None
+    on_limit: Literal["evict", "spill"] = "evict"
+    spill_directory: str = "."
+
+
+def approximate_size(value: Any) -> int:
+    """
+    Estimate the memory held by a message or configuration value.
+
+    Containers are followed recursively; other objects are counted shallowly.
+
+    Args:
+        value (Any): The value to measure.
+
+    Returns:
+        int: The approximate size in bytes.
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(approximate_size(key) + approximate_size(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(approximate_size(item) for item in value)
+    return size
+
+
+def truncate_text(text: str, max_bytes: int) -> str:
+    """
+    Cut a text down to at most `max_bytes` UTF-8 bytes, marking the cut.
+
+    The marker counts towards `max_bytes`; if the cap is too small to hold
+    it, the text is cut without a marker.
+
+    Args:
+        text (str): The text to truncate.
+        max_bytes (int): The maximum size of the result.
+
+    Returns:
+        str: The text unchanged if it fits, else its head followed by a marker.
+    """
+    encoded = text.encode("utf-8")
+    if len(encoded) <= max_bytes:
+        return text
+    # The marker can only get shorter once the omitted count is known
+    budget = max_bytes - len(TRUNCATION_MARKER.format(omitted=len(encoded)).encode("utf-8"))
+    if budget < 0:
+        return encoded[:max_bytes].decode("utf-8", errors="ignore")
+    head = encoded[:budget].decode("utf-8", errors="ignore")
+    omitted = len(encoded) - len(head.encode("utf-8"))
+    return head + TRUNCATION_MARKER.format(omitted=omitted)
+
+
+class HistoryUsage:
+    """
+    Tracks the approximate size of one history and evicts messages over its caps.
+
+    Attributes:
+        bytes (int): Approximate bytes held by the history.
+        spilled_messages (int): Number of evicted messages written to the spill file.
+    """
+
+    def __init__(self):
+        self.bytes = 0
+        self.spilled_messages = 0
+        self._sizes: List[int] = []
+        self._spill_path: Optional[str] = None
+
+    def add(self, message: Dict[str, Any]) -> None:
+        """Account for a message appended to the history."""
+        size = approximate_size(message)
+        self._sizes.append(size)
+        self.bytes += size
+
+    @staticmethod
+    def _over(limits: MemoryLimits, count: int, size: int) -> bool:
+        """Return True if a history of `count` messages and `size` bytes exceeds `limits`."""
+        return (limits.max_history_bytes is not None and size > limits.max_history_bytes) or (
+            limits.max_history_messages is not None and count > limits.max_history_messages
+        )
+
+    def enforce(self, history: List[Dict[str, Any]], limits: MemoryLimits) -> None:
+        """
+        Evict messages from `history` until it fits `limits`.
+
+        Earlier turns, each starting at a user message, are evicted whole and
+        oldest first. If the current turn alone is over the caps, its oldest
+        messages after the prompt are evicted too. The prompt of the current
+        turn, the latest message and the call of a latest tool result are
+        always kept, so a history may stay over its caps. Tool results whose
+        call was evicted are evicted as well.
+
+        Args:
+            history (List[Dict[str, Any]]): The history, modified in place.
+            limits (MemoryLimits): The caps to enforce.
+        """
+        if not self._over(limits, len(history), self.bytes):
+            return
+
+        prompts = [index for index, message in enumerate(history) if message["role"] == "user"]
+        prompt = prompts[-1] if prompts else 0
+
+        # Whole earlier turns first
+        cut = 0
+        for boundary in prompts:
+            if boundary == 0:
+                continue
+            cut = boundary
+            if not self._over(limits, len(history) - cut, self.bytes - sum(self._sizes[:cut])):
+                break
+        self._evict(history, 0, cut, limits)
+        prompt -= cut
+
+        # Then the oldest messages of the current turn
+        last_kept = len(history) - 1
+        if history[last_kept]["role"] == "tool":
+            last_kept -= 1
+        stop = prompt + 1
+        count, size = len(history), self.bytes
+        while stop < last_kept and self._over(limits, count, size):
+            count -= 1
+            size -= self._sizes[stop]
+            stop += 1
+        while prompt + 1 < stop < last_kept and history[stop]["role"] == "tool":
+            stop += 1
+        self._evict(history, prompt + 1, stop, limits)
+
+    def _evict(
+        self, history: List[Dict[str, Any]], start: int, stop: int, limits: MemoryLimits
+    ) -> None:
+        """Remove `history[start:stop]`, spilling it first if configured."""
+        if stop <= start:
+            return
+        if limits.on_limit == "spill":
+            self._spill(history[start:stop], limits.spill_directory)
+        self.bytes -= sum(self._sizes[start:stop])
+        del history[start:stop]
+        del self._sizes[start:stop]
+
+    def _spill(self, messages: List[Dict[str, Any]], directory: str) -> None:
+        """Append evicted messages to this history's spill file."""
+        if self._spill_path is None:
+            self._spill_path = os.path.join(directory, f"history-{uuid.uuid4().hex}.jsonl")
+        with open(self._spill_path, "a", encoding="utf-8") as spill_file:
+            for message in messages:
+                spill_file.write(json.dumps(message, default=str) + "\n")
+        self.spilled_messages += len(messages)
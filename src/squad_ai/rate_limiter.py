@@ -0,0 +1,402 @@
+"""
+This module provides a process-wide rate limiter shared by every interpreter
+talking to the same endpoint and model.
+
+The limiter budgets requests per minute and tokens per minute with token
+buckets, and bounds the number of in-flight requests with a concurrency limit
+that is adjusted AIMD-style: it grows additively on success and is halved
+when the endpoint answers with HTTP 429. It is halved at most once per
+congestion window: requests sent before the last decrease cannot decrease
+it again. Rate limit headers returned by the endpoint (`retry-after`,
+`x-ratelimit-*`) pause or shrink the budgets so that agents back off
+together instead of retrying independently. A 429 without such headers
+pauses the limiter for an exponential backoff with jitter, based on how many
+times that request has been tried. Requests that fail for other reasons
+leave the concurrency limit unchanged.
+
+Classes:
+    - TokenBucket: A refilling budget of requests or tokens per minute.
+    - ConcurrencyLimit: An AIMD limit on the number of requests in flight.
+    - RateLimiter: Combines request, token and concurrency limits for one endpoint.
+
+Functions:
+    - estimate_tokens: Roughly estimate the number of tokens in a request.
+    - backoff_delay: Exponential backoff with full jitter for a retry attempt.
+
+Usage:
+    >>> from squad_ai.rate_limiter import RateLimiter
+    >>> limiter = RateLimiter.for_endpoint(
+    ...     "https://api.openai.com/v1", "gpt-4o", requests_per_minute=500
+    ... )
+    >>> config = InterpreterConfig(rate_limiter=limiter)
+    >>> interpreter = Interpreter(api_key="...", model="gpt-4o", config=config)
+"""
+
+import json
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Mapping, Optional, Tuple
+
+# Rough average of characters per token for English text
+CHARS_PER_TOKEN = 4
+
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 60.0
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_DURATION_UNITS = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+
+
+def estimate_tokens(messages: Any, tools: Any = None) -> int:
+    """
+    Roughly estimate the number of prompt tokens of a request.
+
+    Args:
+        messages (Any): The messages sent to the language model.
+        tools (Any, optional): The tool schemas sent with the request.
+
+    Returns:
+        int: The estimated number of tokens.
+    """
+    size = len(json.dumps(messages, default=str))
+    if tools:
+        size += len(json.dumps(tools, default=str))
+    return size // CHARS_PER_TOKEN + 1
+
+
+def backoff_delay(attempt: int) -> float:
+    """
+    Return the delay before a retry, using exponential backoff with full jitter.
+
+    Args:
+        attempt (int): The number of consecutive failed attempts, starting at 1.
+
+    Returns:
+        float: A random delay in seconds, at most `BACKOFF_MAX`.
+    """
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (attempt - 1)))
+
+
+def _parse_duration(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a rate limit duration header into seconds.
+
+    Accepts plain seconds ("20", "0.5") and the compound format used by
+    OpenAI compatible endpoints ("1s", "6m0s", "250ms").
+    """
+    if value is None:
+        return None
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+class TokenBucket:
+    """
+    A budget that refills continuously up to a per-minute capacity.
+
+    The level may become negative when a reservation is corrected upwards,
+    in which case later acquisitions wait until the debt has been refilled.
+
+    Attributes:
+        capacity (float): The budget per minute.
+        level (float): The currently available budget.
+    """
+
+    def __init__(self, per_minute: float):
+        """
+        Initialize a full bucket.
+
+        Args:
+            per_minute (float): The budget per minute.
+        """
+        self.capacity = float(per_minute)
+        self.level = float(per_minute)
+        self._rate = self.capacity / 60.0
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """
+        Return how long to wait before `amount` is available.
+
+        Requests larger than the capacity only wait for a full bucket.
+        """
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self._rate
+
+    def consume(self, amount: float) -> None:
+        """Take `amount` from the bucket, possibly going into debt."""
+        self.level -= amount
+
+    def restrict(self, remaining: float, now: float) -> None:
+        """
+        Lower the level to the remaining budget reported by the endpoint.
+
+        Args:
+            remaining (float): The budget the endpoint says is left.
+            now (float): The current monotonic time.
+        """
+        self._refill(now)
+        self.level = min(self.level, remaining)
+
+
+class ConcurrencyLimit:
+    """
+    An AIMD limit on the number of requests in flight.
+
+    Attributes:
+        maximum (int): Upper bound of the limit.
+        limit (float): The current limit.
+        window (int): The current congestion window, incremented on every decrease.
+    """
+
+    def __init__(self, maximum: int, initial: Optional[int] = None):
+        """
+        Initialize a concurrency limit.
+
+        Args:
+            maximum (int): Upper bound of the limit.
+            initial (int, optional): Starting limit. Defaults to `maximum`.
+        """
+        self.maximum = maximum
+        self.limit = float(initial or maximum)
+        self.window = 0
+
+    def allows(self, in_flight: int) -> bool:
+        """Return True if another request may be sent while `in_flight` are."""
+        return in_flight < max(1, int(self.limit))
+
+    def increase(self) -> None:
+        """Grow the limit by about one per limit's worth of successful requests."""
+        self.limit = min(float(self.maximum), self.limit + 1 / self.limit)
+
+    def decrease(self, window: Optional[int] = None) -> None:
+        """
+        Halve the limit, unless it was already halved since `window`.
+
+        Args:
+            window (int, optional): The window the rate limited request was
+                sent in. Defaults to the current one.
+        """
+        if window is None or window == self.window:
+            self.window += 1
+            self.limit = max(1.0, self.limit / 2)
+
+
+class RateLimiter:
+    """
+    Coordinates requests to one endpoint/model across all interpreters in the process.
+
+    Attributes:
+        buckets (Dict[str, TokenBucket]): The "requests" and "tokens" per minute
+            budgets; a missing key means that budget is unlimited.
+        concurrency (ConcurrencyLimit): The AIMD limit on in-flight requests.
+        max_retries (int): How many times a rate limited request is retried.
+    """
+
+    _registry: Dict[Tuple[str, str], "RateLimiter"] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_concurrency: int = 64,
+        initial_concurrency: Optional[int] = None,
+        max_retries: int = 5,
+    ):
+        """
+        Initialize a rate limiter.
+
+        Args:
+            requests_per_minute (float, optional): Request budget; unlimited if None.
+            tokens_per_minute (float, optional): Token budget; unlimited if None.
+            max_concurrency (int, optional): Upper bound of in-flight requests.
+            initial_concurrency (int, optional): Starting concurrency limit.
+                Defaults to `max_concurrency`.
+            max_retries (int, optional): Retries allowed for a rate limited request.
+        """
+        self.buckets: Dict[str, TokenBucket] = {}
+        if requests_per_minute:
+            self.buckets["requests"] = TokenBucket(requests_per_minute)
+        if tokens_per_minute:
+            self.buckets["tokens"] = TokenBucket(tokens_per_minute)
+        self.concurrency = ConcurrencyLimit(max_concurrency, initial_concurrency)
+        self.max_retries = max_retries
+        self.in_flight = 0
+        self._paused_until = 0.0
+        self._condition = threading.Condition()
+
+    @classmethod
+    def for_endpoint(cls, base_url: str, model: str, **kwargs) -> "RateLimiter":
+        """
+        Return the shared limiter for an endpoint/model pair, creating it if needed.
+
+        Keyword arguments are only used when the limiter is created.
+
+        Args:
+            base_url (str): The API endpoint.
+            model (str): The model name.
+
+        Returns:
+            RateLimiter: The process-wide limiter for the key.
+        """
+        key = (base_url.rstrip("/"), model)
+        with cls._registry_lock:
+            if key not in cls._registry:
+                cls._registry[key] = cls(**kwargs)
+            return cls._registry[key]
+
+    @staticmethod
+    def _cost(name: str, estimated_tokens: int) -> int:
+        """Return what a request costs from the bucket with the given name."""
+        return 1 if name == "requests" else estimated_tokens
+
+    def _wait_time(self, estimated_tokens: int, now: float) -> float:
+        """Return how long the caller must wait; zero if it may proceed."""
+        waits = [self._paused_until - now]
+        if not self.concurrency.allows(self.in_flight):
+            # Woken up by `release`; the timeout only guards against missed wakeups
+            waits.append(1.0)
+        waits.extend(
+            bucket.wait_time(self._cost(name, estimated_tokens), now)
+            for name, bucket in self.buckets.items()
+        )
+        return max(waits)
+
+    def acquire(self, estimated_tokens: int = 0) -> int:
+        """
+        Block until a request with the given token estimate may be sent.
+
+        Args:
+            estimated_tokens (int, optional): The estimated tokens of the request.
+
+        Returns:
+            int: The congestion window the request is sent in, to pass to `release`.
+        """
+        with self._condition:
+            while True:
+                wait = self._wait_time(estimated_tokens, time.monotonic())
+                if wait <= 0:
+                    break
+                self._condition.wait(wait)
+            self.in_flight += 1
+            for name, bucket in self.buckets.items():
+                bucket.consume(self._cost(name, estimated_tokens))
+            return self.concurrency.window
+
+    def release(  # pylint: disable=too-many-arguments
+        self,
+        estimated_tokens: int = 0,
+        used_tokens: Optional[int] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        rate_limited: bool = False,
+        failed: bool = False,
+        *,
+        window: Optional[int] = None,
+        attempt: int = 1,
+    ) -> None:
+        """
+        Finish a request started with `acquire` and learn from its outcome.
+
+        Only successful requests grow the concurrency limit. A rate limited
+        request halves it, unless the limit was already halved since the
+        request was sent, and pauses the limiter for a backoff when the
+        headers do not say how long to wait. Other failures leave the limit
+        unchanged.
+
+        Args:
+            estimated_tokens (int, optional): The estimate passed to `acquire`.
+            used_tokens (int, optional): The tokens reported by the endpoint.
+            headers (Mapping[str, str], optional): The response headers.
+            rate_limited (bool, optional): Whether the endpoint answered with 429.
+            failed (bool, optional): Whether the request failed for another reason.
+            window (int, optional): The window returned by `acquire`; defaults to
+                the current one.
+            attempt (int, optional): How many times the request has been tried,
+                starting at 1.
+        """
+        with self._condition:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if "tokens" in self.buckets and used_tokens is not None:
+                self.buckets["tokens"].consume(used_tokens - estimated_tokens)
+            paused = self._apply_headers(headers or {}, now, rate_limited)
+            if rate_limited:
+                self.concurrency.decrease(window)
+                if not paused:
+                    self._paused_until = max(
+                        self._paused_until, now + backoff_delay(attempt)
+                    )
+            elif not failed:
+                self.concurrency.increase()
+            self._condition.notify_all()
+
+    @contextmanager
+    def limit(self, estimated_tokens: int = 0, attempt: int = 1) -> Iterator[Dict[str, Any]]:
+        """
+        Context manager wrapping `acquire` and `release`.
+
+        The yielded dictionary may be filled with `used_tokens`, `headers`,
+        `rate_limited` and `failed`, which are passed to `release` on exit.
+        A request left by an exception is released as failed.
+
+        Args:
+            estimated_tokens (int, optional): The estimated tokens of the request.
+            attempt (int, optional): How many times the request has been tried,
+                starting at 1.
+        """
+        window = self.acquire(estimated_tokens)
+        outcome: Dict[str, Any] = {"window": window, "attempt": attempt}
+        try:
+            yield outcome
+        except BaseException:
+            if not outcome.get("rate_limited"):
+                outcome["failed"] = True
+            raise
+        finally:
+            self.release(estimated_tokens, **outcome)
+
+    def _apply_headers(
+        self, headers: Mapping[str, str], now: float, rate_limited: bool
+    ) -> bool:
+        """
+        Pause or shrink the budgets according to rate limit headers.
+
+        Returns True if the headers paused the limiter.
+        """
+        retry_after = _parse_duration(headers.get("retry-after-ms"))
+        if retry_after is not None:
+            retry_after /= 1000
+        else:
+            retry_after = _parse_duration(headers.get("retry-after"))
+        if retry_after is None and rate_limited:
+            retry_after = _parse_duration(headers.get("x-ratelimit-reset-requests"))
+        if retry_after:
+            self._paused_until = max(self._paused_until, now + retry_after)
+
+        for name, bucket in self.buckets.items():
+            remaining = headers.get(f"x-ratelimit-remaining-{name}")
+            if remaining is None:
+                continue
+            try:
+                bucket.restrict(float(remaining), now)
+            except ValueError:
+                continue
+        return bool(retry_after)
@@ -134,9 +134,6 @@ class DynamicTool(Tool):
             *args: Positional arguments passed to the function.
             **kwargs: Keyword arguments passed to the function.
         """
-        print(
-            f"Executing dynamic tool '{self.name}' with args: {args}, kwargs: {kwargs}"
-        )
         return self.func(*args, **kwargs)
 
     def get_schema(self) -> Dict[str, Any]: